@@ -8,9 +8,13 @@ from agent.tools.grep import grep
 from agent.tools.ls import ls
 from agent.tools.glob import glob
 
+# 系统提示词与问题无关，模块加载时构建一次
+prompt = load_prompt_template("code_sys", context=get_project_structure_xml())
+
+_AGENT = None
+
 def create_agent():
     chat_model = llm_model
-    prompt = load_prompt_template("code_sys", context=get_project_structure_xml())
     tools = [
         ls,
         grep,
@@ -27,3 +31,9 @@ def create_agent():
     return agent
 
 
+def get_agent():
+    """获取进程内共享的agent实例，首次调用时创建"""
+    global _AGENT
+    if _AGENT is None:
+        _AGENT = create_agent()
+    return _AGENT
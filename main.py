@@ -1,22 +1,25 @@
 from dotenv import load_dotenv
 from pathlib import Path
 import os
+import sys
+import asyncio
 load_dotenv(dotenv_path=Path(os.path.join(os.path.dirname(__file__), ".env")), verbose=True)
 
 
-from agent.react_agent import create_agent
+from agent.react_agent import get_agent
 
-def query(question: str):
-    react_agent = create_agent()
-    result = react_agent.stream(
+async def query(question: str):
+    react_agent = get_agent()
+    result = react_agent.astream(
         {
             "messages": [
                 {"role": "user", "content": question}
             ]
         }
     )
-    for chunk in result:
-        print(chunk)
+    async for chunk in result:
+        sys.stdout.write(f"{chunk}\n")
+        sys.stdout.flush()
 
 
 
@@ -24,4 +27,4 @@ def query(question: str):
 if __name__ == "__main__":
     # question = "当前项目是如何实现读文件的"
     question = "帮我查找项目中有关提示词模板的内容"
-    query(question)
+    asyncio.run(query(question))
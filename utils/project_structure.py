@@ -1,13 +1,13 @@
 import os
-import json
-import subprocess
-from pathlib import Path
-from typing import List, Optional
-from dataclasses import dataclass
+import functools
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
 
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
-from typing import Any
+import pygit2
+
+from xml.etree.ElementTree import Element, SubElement, indent, tostring
+from xml.sax.saxutils import escape
+from typing import Any, get_origin
 
 
 @dataclass
@@ -16,141 +16,237 @@ class RepoInfo:
     currentDirectory: str          # 当前工作目录
     rootPath: str                  # 仓库根目录
     repoURL: str                   # 仓库远程URL（优先取origin）
-    repoPath: str                  # 仓库根目录绝对路径
     Branch: str                    # 当前分支
-    status: str                    # git status信息
-    recentCommit: List[str]        # 最近commit信息列表（哈希、作者、日期、信息等）
-    directoryStructure: str        # 目录结构（JSON字符串）
+    status: str                    # 已跟踪文件的变更状态（两位状态码 + 路径）
+    recentCommit: list[str]        # 最近commit信息列表（哈希、作者、日期、信息等）
+    directoryStructure: str        # 目录结构（Markdown树形字符串）
     hasReadme: bool                # 是否有README文件
     hasMakefile: bool              # 是否有Makefile
     totalFiles: int                # 总文件数
     totalDirectories: int          # 总目录数（不含.git等忽略目录）
 
-def get_project_structure() -> Optional[RepoInfo]:
-    """获取项目仓库信息并返回RepoInfo实例"""
+
+# 构建目录树时忽略的目录（按名称匹配）
+IGNORE_DIRS = frozenset({
+    '.git', '__pycache__', '.idea', '.vscode', 'node_modules',
+    '.mypy_cache', '.pytest_cache', 'dist', 'build',
+})
+
+# pygit2状态位到两位状态码的映射（索引区、工作区）
+# repo.status()不做重命名检测且已排除未跟踪文件，重命名显示为删除+新增
+_INDEX_STATUS_CODES = (
+    (pygit2.GIT_STATUS_INDEX_NEW, "A"),
+    (pygit2.GIT_STATUS_INDEX_MODIFIED, "M"),
+    (pygit2.GIT_STATUS_INDEX_DELETED, "D"),
+    (pygit2.GIT_STATUS_INDEX_TYPECHANGE, "T"),
+)
+_WORKTREE_STATUS_CODES = (
+    (pygit2.GIT_STATUS_WT_MODIFIED, "M"),
+    (pygit2.GIT_STATUS_WT_DELETED, "D"),
+    (pygit2.GIT_STATUS_WT_TYPECHANGE, "T"),
+)
+
+
+def _status_code(flags: int) -> str:
+    """将pygit2状态位转换为两位状态码（如"M "、" M"）"""
+    index_code = next((code for flag, code in _INDEX_STATUS_CODES if flags & flag), " ")
+    worktree_code = next((code for flag, code in _WORKTREE_STATUS_CODES if flags & flag), " ")
+    return f"{index_code}{worktree_code}"
+
+
+def _format_git_date(signature: pygit2.Signature) -> str:
+    """按git log默认的%ad格式格式化签名时间（如"Wed Oct 14 03:59:01 2026 +0000"）"""
+    tz = timezone(timedelta(minutes=signature.offset))
+    dt = datetime.fromtimestamp(signature.time, tz)
+    return f"{dt:%a %b} {dt.day} {dt:%H:%M:%S %Y %z}"
+
+
+def _list_tracked_children(tree: pygit2.Tree) -> list[tuple[str, bool, Any]]:
+    """列出git树对象的子项（纯内存对象读取，不访问工作区）"""
+    return [
+        (obj.name, obj.type_str == "tree", obj)
+        for obj in tree
+        if obj.name not in IGNORE_DIRS
+    ]
+
+
+def _list_worktree_children(path_str: str) -> list[tuple[str, bool, Any]]:
+    """基于os.scandir列出工作区目录的子项（DirEntry.is_dir结果已缓存，无额外stat）"""
+    # 先按名称过滤忽略项，再调用任何DirEntry方法
+    with os.scandir(path_str) as it:
+        return [
+            (entry.name, entry.is_dir(follow_symlinks=False), entry.path)
+            for entry in it
+            if entry.name not in IGNORE_DIRS
+        ]
+
+
+@dataclass
+class _GitInfo:
+    """git元信息（RepoInfo中来自git的部分）"""
+    repoURL: str
+    Branch: str
+    status: str
+    recentCommit: list[str]
+
+
+@dataclass
+class _TreeInfo:
+    """目录树信息（RepoInfo中来自目录遍历的部分）"""
+    directoryStructure: str
+    hasReadme: bool
+    hasMakefile: bool
+    totalFiles: int
+    totalDirectories: int
+
+
+def _build_markdown_tree(root_name: str, root_node: Any, list_children) -> _TreeInfo:
+    """
+    迭代构建Markdown树形结构字符串（显式栈，避免递归），同时统计文件和目录数量并检测README和Makefile
+
+    参数:
+        root_name: 根节点名称
+        root_node: 根节点句柄（目录路径或git树对象）
+        list_children: 列出节点子项的函数，返回(名称, 是否为目录, 子节点句柄)列表
+    """
+    total_files = 0
+    total_dirs = 0
+    has_readme = False
+    has_makefile = False
+
+    # 根节点；输出按片段追加，最终一次性拼接，避免逐行拼接产生临时字符串
+    total_dirs += 1
+    fragments = ["- ", root_name, "/\n"]
+
+    # 栈元素: (名称, 是否为目录, 节点句柄, 前缀, 是否为最后一项)，子项逆序入栈以保持输出顺序
+    # 前缀字符串每个目录只构建一次，由其全部子项共享
+    stack = []
+
+    def push_children(node, prefix: str):
+        children = list_children(node)
+        # 目录优先，再按名称排序，保证输出稳定
+        children.sort(key=lambda c: (not c[1], c[0]))
+        last_index = len(children) - 1
+        for i in range(last_index, -1, -1):
+            stack.append((*children[i], prefix, i == last_index))
+        return children
+
+    # 遍历根目录时顺带检测README和Makefile，无需额外stat
+    for name, _, _ in push_children(root_node, "    "):
+        name = name.lower()
+        if name in ('readme', 'readme.md'):
+            has_readme = True
+        elif name == 'makefile':
+            has_makefile = True
+
+    while stack:
+        name, is_dir, node, prefix, is_last = stack.pop()
+        connector = "└── " if is_last else "├── "
+
+        # 统计目录/文件
+        if is_dir:
+            total_dirs += 1
+            fragments.extend((prefix, connector, name, "/\n"))
+            push_children(node, prefix + ("    " if is_last else "│   "))
+        else:
+            total_files += 1
+            fragments.extend((prefix, connector, name, "\n"))
+
+    return _TreeInfo(
+        directoryStructure="".join(fragments),
+        hasReadme=has_readme,
+        hasMakefile=has_makefile,
+        totalFiles=total_files,
+        totalDirectories=total_dirs
+    )
+
+
+def _read_git_info(repo: pygit2.Repository) -> _GitInfo:
+    """读取远程URL、分支、状态及最近commit信息"""
+    # 远程仓库URL（优先取origin）
+    try:
+        repo_url = repo.remotes["origin"].url
+    except KeyError:
+        repo_url = ""
+
+    # 分支与状态信息（"## 分支"头部 + 每个变更文件一行，不含未跟踪文件）
+    if repo.head_is_unborn:
+        # 尚无提交的仓库，HEAD仅为指向未创建分支的符号引用
+        current_branch = repo.lookup_reference("HEAD").target.removeprefix("refs/heads/")
+    else:
+        current_branch = repo.head.shorthand
+    status_lines = [f"## {current_branch}"]
+    for file_path, flags in sorted(repo.status(untracked_files="no").items()):
+        status_lines.append(f"{_status_code(flags)} {file_path}")
+
+    # 最近commit信息（哈希、作者、邮箱、日期、标题）
+    recent_commit = []
+    if not repo.head_is_unborn:
+        commit = repo[repo.head.target]
+        recent_commit = [
+            str(commit.id),
+            commit.author.name,
+            commit.author.email,
+            _format_git_date(commit.author),
+            commit.message.split("\n", 1)[0],
+        ]
+
+    return _GitInfo(
+        repoURL=repo_url,
+        Branch=current_branch,
+        status="\n".join(status_lines),
+        recentCommit=recent_commit
+    )
+
+
+def _walk_tree(repo: pygit2.Repository, root_path: str) -> _TreeInfo:
+    """构建仓库目录树"""
+    root_name = os.path.basename(root_path)
+
+    # 优先使用HEAD树（仅含已跟踪文件，天然遵循.gitignore，且无需访问工作区），
+    # 仓库尚无提交时回退到遍历工作区
+    if not repo.head_is_unborn:
+        head_tree = repo[repo.head.target].tree
+        return _build_markdown_tree(root_name, head_tree, _list_tracked_children)
+    return _build_markdown_tree(root_name, root_path, _list_worktree_children)
+
+
+@functools.lru_cache(maxsize=1)
+def get_project_structure() -> RepoInfo | None:
+    """获取项目仓库信息并返回RepoInfo实例（进程内缓存，仓库结构在进程生命周期内视为不变）"""
     try:
         # 1. 基础路径信息
         current_dir = os.getcwd()
-        root_path = subprocess.check_output(
-            ['git', 'rev-parse', '--show-toplevel'],
-            stderr=subprocess.STDOUT,
-            text=True
-        ).strip()
 
+        # 进程内通过libgit2读取git元信息，无需fork git子进程
+        repo_dir = pygit2.discover_repository(current_dir)
+        if repo_dir is None:
+            print(f"当前目录不是git仓库: {current_dir}")
+            return None
+        repo = pygit2.Repository(repo_dir)
+        root_path = os.path.normpath(repo.workdir)
 
-
-        # 2. 远程仓库URL（优先取origin）
-        remote_info = subprocess.check_output(
-            ['git', 'remote', '-v'],
-            stderr=subprocess.STDOUT,
-            text=True
-        ).strip()
-        repo_url = ""
-        for line in remote_info.split('\n'):
-            if line.startswith('origin') and 'fetch' in line:
-                repo_url = line.split()[1]
-                break
-
-        # 3. 分支信息
-        branch_output = subprocess.check_output(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            stderr=subprocess.STDOUT,
-            text=True
-        ).strip()
-        current_branch = branch_output
-
-        # 4. 状态信息
-        status_info = subprocess.check_output(
-            ['git', 'status'],
-            stderr=subprocess.STDOUT,
-            text=True
-        ).strip()
-
-        # 5. 最近commit信息
-        commit_output = subprocess.check_output(
-            ['git', 'log', '-1', '--pretty=format:%H%n%an%n%ae%n%ad%n%s'],
-            stderr=subprocess.STDOUT,
-            text=True
-        ).strip()
-        recent_commit = commit_output.split('\n')
-
-        # 6. 目录结构及统计（同时计算文件和目录数量）
-        ignore_dirs = {'.git', '__pycache__', '.idea', '.vscode', 'node_modules'}
-        total_files = 0
-        total_dirs = 0
-
-        def build_markdown_tree(path: Path, prefix: str = "", is_last: bool = True) -> str:
-            """递归构建Markdown树形结构字符串"""
-            nonlocal total_files, total_dirs
-
-            # 忽略指定目录
-            if path.name in ignore_dirs:
-                return ""
-
-            # 统计目录
-            if path.is_dir():
-                total_dirs += 1
-                item_str = f"{path.name}/"
-            else:
-                total_files += 1
-                item_str = path.name
-
-            # 确定当前行的前缀符号
-            if prefix == "":  # 根节点
-                line = f"- {item_str}\n"
-            else:
-                connector = "└── " if is_last else "├── "
-                line = f"{prefix}{connector}{item_str}\n"
-
-            # 如果是目录，递归处理子项
-            if path.is_dir() and path.name not in ignore_dirs:
-                children = []
-                for item in path.iterdir():
-                    if item.name not in ignore_dirs:
-                        children.append(item)
-
-                # 处理子项的前缀
-                if is_last:
-                    new_prefix = f"{prefix}    "
-                else:
-                    new_prefix = f"{prefix}│   "
-
-                # 递归添加子项
-                for i, child in enumerate(children):
-                    is_last_child = (i == len(children) - 1)
-                    line += build_markdown_tree(child, new_prefix, is_last_child)
-
-            return line
-
-        # 从根目录开始构建树形结构
-        root_path_obj = Path(root_path)
-        dir_structure = build_markdown_tree(root_path_obj)
-
-        # 7. 检查是否有README和Makefile
-        has_readme = any(
-            root_path_obj.joinpath(f).exists()
-            for f in ['README', 'README.md', 'readme', 'readme.md']
-        )
-        has_makefile = root_path_obj.joinpath('Makefile').exists() or root_path_obj.joinpath('makefile').exists()
+        # 2. git元信息与目录树
+        git_info = _read_git_info(repo)
+        tree_info = _walk_tree(repo, root_path)
 
         # 构建并返回结构体
         return RepoInfo(
             currentDirectory=current_dir,
             rootPath=root_path,
-            repoURL=repo_url,
-            repoPath=root_path,
-            Branch=current_branch,
-            status=status_info,
-            recentCommit=recent_commit,
-            directoryStructure=dir_structure,
-            hasReadme=has_readme,
-            hasMakefile=has_makefile,
-            totalFiles=total_files,
-            totalDirectories=total_dirs
+            repoURL=git_info.repoURL,
+            Branch=git_info.Branch,
+            status=git_info.status,
+            recentCommit=git_info.recentCommit,
+            directoryStructure=tree_info.directoryStructure,
+            hasReadme=tree_info.hasReadme,
+            hasMakefile=tree_info.hasMakefile,
+            totalFiles=tree_info.totalFiles,
+            totalDirectories=tree_info.totalDirectories
         )
 
-    except subprocess.CalledProcessError as e:
-        print(f"Git命令执行错误: {e.output}")
+    except pygit2.GitError as e:
+        print(f"Git操作错误: {e}")
         return None
     except Exception as e:
         print(f"发生错误: {str(e)}")
@@ -213,17 +309,88 @@ def class_to_xml(obj: Any, root_tag: str = None) -> str:
             safe_attr_name = attr_name.replace("_", "-").lower()
             build_xml(root, safe_attr_name, attr_value)
 
-    # 格式化XML（增加缩进和换行）
-    rough_xml = tostring(root, 'utf-8')
-    parsed_xml = minidom.parseString(rough_xml)
-    return parsed_xml.toprettyxml(indent="  ")
+    # 原地缩进格式化后直接序列化，避免minidom二次解析
+    indent(root, space="  ")
+    return tostring(root, encoding="unicode")
+
+
+# RepoInfo字段的序列化方式，按字段类型在模块加载时确定，序列化时无需逐值isinstance判断
+_FIELD_TEXT = 0    # 字符串/整数，直接转为文本
+_FIELD_BOOL = 1    # 布尔值，转为小写true/false
+_FIELD_LIST = 2    # 列表，每项输出为<item>子节点
+_FIELD_CDATA = 3   # 大段文本，包裹为CDATA以跳过逐字符实体转义
+
+# 以CDATA输出的字段（目录树可达数十KB，且几乎不含需转义的字符）
+_CDATA_FIELDS = frozenset({"directoryStructure"})
+
+
+def _field_kind(field_name: str, field_type: Any) -> int:
+    """根据字段名和类型确定RepoInfo字段的XML序列化方式"""
+    if field_name in _CDATA_FIELDS:
+        return _FIELD_CDATA
+    if field_type is bool:
+        return _FIELD_BOOL
+    if get_origin(field_type) is list:
+        return _FIELD_LIST
+    return _FIELD_TEXT
+
+
+# RepoInfo字段名、对应的XML标签名（与class_to_xml的命名规则一致）及序列化方式
+_REPO_INFO_FIELDS = tuple(
+    (field.name, field.name.replace("_", "-").lower(), _field_kind(field.name, field.type))
+    for field in fields(RepoInfo)
+)
 
 
-def get_project_structure_xml() -> Optional[str]:
-    """获取项目仓库信息并返回 XML 字符串"""
+def repo_info_to_xml(repo_info: RepoInfo) -> str:
+    """
+    将RepoInfo实例转换为XML格式字符串
+
+    RepoInfo的字段结构固定，直接拼接XML文本，无需构建ElementTree与逐属性反射；
+    除目录结构以CDATA输出外，其余与class_to_xml(repo_info)一致。
+
+    参数:
+        repo_info: 项目仓库信息
+    返回:
+        格式化后的XML字符串
+    """
+    parts = ["<repoinfo>\n"]
+    for attr_name, tag, kind in _REPO_INFO_FIELDS:
+        value = getattr(repo_info, attr_name)
+        if kind == _FIELD_LIST:
+            if not value:
+                parts.append(f"  <{tag} />\n")
+                continue
+            parts.append(f"  <{tag}>\n")
+            for item in value:
+                parts.append(f"    <item>{escape(item)}</item>\n")
+            parts.append(f"  </{tag}>\n")
+            continue
+
+        if kind == _FIELD_CDATA:
+            if not value:
+                parts.append(f"  <{tag} />\n")
+                continue
+            # "]]>"会提前结束CDATA段，拆分为两个相邻的CDATA段
+            text = value.replace("]]>", "]]]]><![CDATA[>")
+            parts.append(f"  <{tag}><![CDATA[{text}]]></{tag}>\n")
+            continue
+
+        text = ("true" if value else "false") if kind == _FIELD_BOOL else str(value)
+        if text:
+            parts.append(f"  <{tag}>{escape(text)}</{tag}>\n")
+        else:
+            parts.append(f"  <{tag} />\n")
+    parts.append("</repoinfo>")
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=1)
+def get_project_structure_xml() -> str | None:
+    """获取项目仓库信息并返回 XML 字符串（进程内缓存）"""
     repo_info = get_project_structure()
     if repo_info:
-        return class_to_xml(repo_info)
+        return repo_info_to_xml(repo_info)
     return None
 
 if __name__ == "__main__":
@@ -233,7 +400,6 @@ if __name__ == "__main__":
         print(f"当前目录: {repo_info.currentDirectory}")
         print(f"仓库根目录: {repo_info.rootPath}")
         print(f"仓库URL: {repo_info.repoURL}")
-        print(f"仓库路径: {repo_info.repoPath}")
         print(f"当前分支: {repo_info.Branch}")
         print(f"状态: {repo_info.status}")
         print(f"最近提交: {repo_info.recentCommit}")